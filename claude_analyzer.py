@@ -4,88 +4,56 @@ Interactive Claude PDF Analyzer
 Analyze PDF sections using Claude API with prompt caching
 """
 
+import hashlib
+import json
+import mmap
 import os
+import shelve
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
-import anthropic
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional, Tuple
 
+if TYPE_CHECKING:
+    import anthropic
 
-class ClaudePDFAnalyzer:
-    # Preset system prompt templates
-    PRESET_PROMPTS = {
-        'generic': """You are an expert document analyzer. You have been provided with a document structure summary. Answer questions clearly and cite specific sections when relevant.""",
-        
-        'research': """You are a senior research analyst and peer reviewer with 20 years of experience in academic research.
-
-When analyzing documents:
-- Critically evaluate methodology and experimental design
-- Assess statistical validity and significance
-- Identify potential biases and confounding factors
-- Check reproducibility and data transparency
-- Rate evidence strength and quality
-- Highlight gaps in reasoning or evidence
-- Always cite specific page numbers and sections
-
-Be constructively critical while remaining objective.""",
-        
-        'legal': """You are a senior legal analyst specializing in contract and document review.
-
-Focus on:
-- Key obligations, rights, and liabilities
-- Ambiguous or unclear language
-- Potential legal risks and exposure
-- Missing or incomplete provisions
-- Conflicting or contradictory clauses
-- Compliance and regulatory implications
-- Definitions and their scope
-
-Use precise legal terminology and cite specific sections, pages, and clause numbers.""",
-        
-        'business': """You are a strategic business consultant and MBA with expertise in business analysis.
-
-Analyze documents for:
-- Key metrics, KPIs, and financial data
-- Market opportunities and competitive positioning
-- Strategic strengths and weaknesses
-- Operational risks and challenges
-- Growth drivers and barriers
-- Actionable recommendations
-- ROI and value propositions
 
-Present insights in clear, executive-friendly language with data-driven support.""",
-        
-        'technical': """You are a senior software architect and technical lead with 15+ years of experience.
-
-When reviewing technical documentation:
-- Evaluate architecture and design patterns
-- Identify implementation gaps and inconsistencies
-- Assess scalability, performance, and security considerations
-- Check for best practices and anti-patterns
-- Flag potential technical debt and maintenance issues
-- Verify API contracts and interface definitions
-- Suggest improvements with specific examples
-- Consider edge cases and error handling
+# Pricing per token (as of 2025, check anthropic.com/pricing for current rates)
+_INPUT_PRICE = 3.00 / 1_000_000  # $3 per million tokens
+_OUTPUT_PRICE = 15.00 / 1_000_000  # $15 per million tokens
+_CACHE_WRITE_PRICE = 3.75 / 1_000_000  # $3.75 per million tokens
+_CACHE_WRITE_1H_PRICE = 6.00 / 1_000_000  # $6 per million tokens
+_CACHE_READ_PRICE = 0.30 / 1_000_000  # $0.30 per million tokens
 
-Provide code examples, pseudo-code, or diagrams when relevant. Reference specific sections and page numbers.""",
-        
-        'medical': """You are a medical research analyst with expertise in clinical documentation and evidence-based medicine.
+# Preset system prompt templates, one text file per mode
+_PROMPTS_DIR = Path(__file__).parent / "prompts"
 
-When analyzing medical documents:
-- Evaluate clinical methodology and patient selection
-- Assess endpoint definitions and measurement validity
-- Check for adverse events and safety reporting
-- Verify statistical approaches and power calculations
-- Identify conflicts of interest or bias
-- Rate evidence quality (GRADE criteria when applicable)
-- Consider clinical significance vs statistical significance
-- Always cite specific sections and page numbers
 
-Note: Provide analytical insights only, not medical advice."""
-    }
+class ClaudePDFAnalyzer:
+    MODEL = "claude-sonnet-4-20250514"
+    
+    # Transient failures (429, 5xx, overloaded, connection errors) are retried
+    # by the SDK with exponential backoff before an error reaches ask()
+    MAX_RETRIES = 4
+    REQUEST_TIMEOUT = 120.0  # seconds
     
-    def __init__(self, api_key: Optional[str] = None, mode: str = 'generic', custom_prompt: Optional[str] = None):
-        """Initialize with Anthropic API key and analysis mode"""
+    # The document context rarely changes during a session, so it is cached for an
+    # hour instead of the default 5 minutes and survives longer pauses
+    CONTEXT_CACHE_TTL = "1h"
+    
+    # One client per API key, shared by all analyzers so connections are reused
+    _clients: Dict[str, "anthropic.Anthropic"] = {}
+    
+    # Preset analysis modes, prompts are read from _PROMPTS_DIR on first use
+    PRESET_MODES = ('generic', 'research', 'legal', 'business', 'technical', 'medical')
+    
+    def __init__(self, api_key: Optional[str] = None, mode: str = 'generic', custom_prompt: Optional[str] = None,
+                 response_cache: Optional[str] = None):
+        """
+        Initialize with Anthropic API key and analysis mode
+        If response_cache is a file path, answers are stored there and reused for repeated questions
+        """
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError(
@@ -93,40 +61,70 @@ Note: Provide analytical insights only, not medical advice."""
                 "or pass api_key parameter"
             )
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Imported here so the CLI can list modes without loading the SDK
+        import anthropic as _anthropic
+        self._anthropic = _anthropic
+        self.client = self._clients.get(self.api_key)
+        if self.client is None:
+            self.client = _anthropic.Anthropic(
+                api_key=self.api_key,
+                max_retries=self.MAX_RETRIES,
+                timeout=self.REQUEST_TIMEOUT,
+                default_headers={"anthropic-beta": "extended-cache-ttl-2025-04-11"}
+            )
+            self._clients[self.api_key] = self.client
         self.document_context = None
+        self._context_hash = None
+        self._system_messages = None
+        self.response_cache = response_cache
+        self.response_cache_hits = 0
         self.conversation_history = []
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.cache_creation_tokens = 0
         self.cache_read_tokens = 0
+        self._messages_sent = 0
+        self._running_cost = 0.0
+        
+        # Older turns are summarized once the history outgrows this budget
+        self.history_token_budget = 20_000
+        self.window_turns = 8
         
         # Set system prompt
         if custom_prompt:
             self.system_prompt = custom_prompt
             self.current_mode = 'custom'
+            self._rebuild_system_messages()
         else:
             self.set_mode(mode)
     
     def set_mode(self, mode: str):
         """Set analysis mode with preset prompt"""
-        if mode not in self.PRESET_PROMPTS:
-            available = ', '.join(self.PRESET_PROMPTS.keys())
+        if mode not in self.PRESET_MODES:
+            available = ', '.join(self.PRESET_MODES)
             raise ValueError(f"Invalid mode '{mode}'. Available modes: {available}")
         
-        self.system_prompt = self.PRESET_PROMPTS[mode]
+        self.system_prompt = self.get_preset_prompt(mode)
         self.current_mode = mode
+        self._rebuild_system_messages()
         print(f"✓ Analysis mode set to: {mode}\n")
     
     def set_custom_prompt(self, prompt: str):
         """Set a custom system prompt"""
         self.system_prompt = prompt
         self.current_mode = 'custom'
+        self._rebuild_system_messages()
         print(f"✓ Custom system prompt set ({len(prompt)} characters)\n")
     
     def get_available_modes(self) -> List[str]:
         """Get list of available preset modes"""
-        return list(self.PRESET_PROMPTS.keys())
+        return list(self.PRESET_MODES)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_preset_prompt(mode: str) -> str:
+        """Read a preset system prompt from its template file"""
+        return (_PROMPTS_DIR / f"{mode}.txt").read_text(encoding='utf-8').strip()
     
     def show_current_mode(self):
         """Display current analysis mode and prompt"""
@@ -141,12 +139,24 @@ Note: Provide analytical insights only, not medical advice."""
         if not context_path.exists():
             raise FileNotFoundError(f"Context file not found: {context_file}")
         
-        with open(context_path, 'r', encoding='utf-8') as f:
-            self.document_context = f.read()
+        if context_path.stat().st_size == 0:
+            self.document_context = ""
+            self._context_hash = hashlib.blake2b(b"").hexdigest()
+        else:
+            # Hash and decode straight from the mapped file, without an intermediate bytes copy
+            with open(context_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._context_hash = hashlib.blake2b(mm).hexdigest()
+                text = str(mm, 'utf-8')
+            
+            # Same universal newline handling as a text-mode read
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self.document_context = text
+        self._rebuild_system_messages()
         
         print(f"✓ Loaded context from: {context_file}")
         print(f"  Context size: {len(self.document_context)} characters")
-        print(f"  Estimated tokens: ~{len(self.document_context.split()) * 1.3:.0f}")
+        print(f"  Estimated tokens: ~{len(self.document_context) // 4}")  # ~4 characters per token
         print()
     
     def load_section(self, section_file: str) -> str:
@@ -155,107 +165,304 @@ Note: Provide analytical insights only, not medical advice."""
         if not section_path.exists():
             raise FileNotFoundError(f"Section file not found: {section_file}")
         
-        with open(section_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return section_path.read_text(encoding='utf-8')
     
-    def ask(self, question: str, section_files: Optional[List[str]] = None) -> str:
+    def _safe_load_section(self, section_file: str) -> Optional[str]:
+        """Load a section file, warning and returning None if it does not exist"""
+        try:
+            return self.load_section(section_file)
+        except FileNotFoundError as e:
+            print(f"Warning: {e}")
+            return None
+    
+    def _prepare_turn(self, question: str, section_files: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
         """
-        Ask Claude a question about the document
-        Optionally include specific section files for detailed analysis
+        Build the pending user turn and the keyword arguments for the messages API call
+        The history is left untouched until the turn is committed after a successful answer
         """
         if not self.document_context:
             raise ValueError("No context loaded. Call load_context() first.")
         
-        # Build the user message
-        user_content = question
+        # Build the user message from parts, joined once at the end
+        parts = [question]
         
         # Add section content if provided
         if section_files:
-            sections_content = []
-            for section_file in section_files:
-                try:
-                    section_content = self.load_section(section_file)
-                    sections_content.append(f"\n\n--- Content from {section_file} ---\n\n{section_content}")
-                except FileNotFoundError as e:
-                    print(f"Warning: {e}")
+            # Read all section files concurrently, results keep the given order
+            with ThreadPoolExecutor(max_workers=min(8, len(section_files))) as executor:
+                loaded = list(executor.map(self._safe_load_section, section_files))
             
-            if sections_content:
-                user_content += "\n\n" + "\n".join(sections_content)
+            for section_file, section_content in zip(section_files, loaded):
+                if section_content is not None:
+                    parts.append(f"\n\n--- Content from {section_file} ---\n\n{section_content}")
         
-        # Add to conversation history
-        self.conversation_history.append({
+        pending = {
             "role": "user",
-            "content": user_content
-        })
+            "content": "".join(parts)
+        }
         
-        # Create system messages with caching
-        system_messages = [
+        request = {
+            "model": self.MODEL,
+            "max_tokens": 4096,
+            "system": self._system_messages,
+            "messages": self._with_cache_breakpoints(self.conversation_history + [pending])
+        }
+        return pending, request
+    
+    def _commit_turn(self, pending: Dict, assistant_message: str):
+        """Add a completed question and answer pair to the conversation history"""
+        self.conversation_history.extend([
+            pending,
+            {"role": "assistant", "content": assistant_message}
+        ])
+    
+    def _rebuild_system_messages(self):
+        """
+        Create system messages with caching
+        Built once per prompt or context change and reused by every request.
+        The context block references document_context itself rather than a
+        formatted copy, so a large context is held in memory only once.
+        The context comes before the mode prompt, so switching modes keeps
+        the cached context prefix valid
+        """
+        if self.document_context is None:
+            self._system_messages = None
+            return
+        
+        self._system_messages = [
+            {
+                "type": "text",
+                "text": "DOCUMENT CONTEXT:\n\n"
+            },
             {
                 "type": "text",
-                "text": self.system_prompt
+                "text": self.document_context,
+                "cache_control": {"type": "ephemeral", "ttl": self.CONTEXT_CACHE_TTL}  # Cache the context!
             },
             {
                 "type": "text",
-                "text": f"DOCUMENT CONTEXT:\n\n{self.document_context}",
-                "cache_control": {"type": "ephemeral"}  # Cache the context!
+                "text": f"\n\n{self.system_prompt}"
             }
         ]
+    
+    def _trim_history(self):
+        """
+        Keep the conversation history within the token budget
+        Once the estimated history size exceeds history_token_budget, the older turns
+        are replaced by a summary written by Claude. At most the last window_turns
+        exchanges are kept, and only as many as fit in half the budget, so a few
+        large turns do not keep the history over it and the next summary is
+        not needed again right away
+        """
+        if len(self.conversation_history) <= 2:
+            return
+        
+        # ~4 characters per token
+        sizes = [len(str(message["content"])) // 4 for message in self.conversation_history]
+        if sum(sizes) <= self.history_token_budget:
+            return
+        
+        # Walk back over whole exchanges, always keeping the latest one
+        split = len(sizes) - 2
+        kept = sizes[-1] + sizes[-2]
+        while split >= 2 and len(sizes) - split < 2 * self.window_turns:
+            exchange = sizes[split - 1] + sizes[split - 2]
+            if kept + exchange > self.history_token_budget // 2:
+                break
+            kept += exchange
+            split -= 2
+        
+        if split > 0:
+            self._summarize_older_turns(split)
+    
+    def _summarize_older_turns(self, split: int):
+        """Replace the turns before index split with a compact summary"""
+        older = self.conversation_history[:split]
+        recent = self.conversation_history[split:]
         
-        # Make API call
         try:
             response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system=system_messages,
-                messages=self.conversation_history
+                model=self.MODEL,
+                max_tokens=1024,
+                system=self._system_messages,
+                messages=older + [{
+                    "role": "user",
+                    "content": "Summarize our discussion so far in a compact form. Keep every question, "
+                               "conclusion, figure and section reference needed to continue the analysis."
+                }]
             )
-            
-            # Track token usage
-            usage = response.usage
-            self.total_input_tokens += usage.input_tokens
-            self.total_output_tokens += usage.output_tokens
-            
-            # Track cache metrics
-            if hasattr(usage, 'cache_creation_input_tokens'):
-                self.cache_creation_tokens += usage.cache_creation_input_tokens
-            if hasattr(usage, 'cache_read_input_tokens'):
-                self.cache_read_tokens += usage.cache_read_input_tokens
-            
-            # Get response text
-            assistant_message = response.content[0].text
-            
-            # Add to conversation history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
-            
-            return assistant_message
-            
-        except anthropic.APIError as e:
+        except self._anthropic.APIError as e:
+            print(f"Warning: could not summarize earlier conversation: {e}")
+            return
+        
+        self._record_usage(response.usage)
+        summary = response.content[0].text
+        
+        self.conversation_history = [
+            {"role": "user", "content": f"[Summary of earlier discussion]: {summary}"},
+            {"role": "assistant", "content": "Understood. I will continue from this summary."}
+        ] + recent
+    
+    def _record_usage(self, usage):
+        """Add the token usage and cost of a response to the running totals"""
+        cache_creation = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        cache_creation_1h = getattr(getattr(usage, 'cache_creation', None), 'ephemeral_1h_input_tokens', None) or 0
+        cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+        
+        self.total_input_tokens += usage.input_tokens
+        self.total_output_tokens += usage.output_tokens
+        
+        # Track cache metrics
+        self.cache_creation_tokens += cache_creation
+        self.cache_read_tokens += cache_read
+        
+        self._running_cost += (usage.input_tokens * _INPUT_PRICE
+                               + usage.output_tokens * _OUTPUT_PRICE
+                               + (cache_creation - cache_creation_1h) * _CACHE_WRITE_PRICE
+                               + cache_creation_1h * _CACHE_WRITE_1H_PRICE
+                               + cache_read * _CACHE_READ_PRICE)
+    
+    def ask(self, question: str, section_files: Optional[List[str]] = None) -> str:
+        """
+        Ask Claude a question about the document
+        Optionally include specific section files for detailed analysis
+        """
+        pending, request = self._prepare_turn(question, section_files)
+        
+        # Answer from the local response cache if this exact turn was seen before
+        cache_key = self._response_cache_key(pending)
+        cached = self._lookup_response(cache_key)
+        if cached is not None:
+            self._commit_turn(pending, cached)
+            self._trim_history()
+            return cached
+        
+        # Make API call
+        try:
+            response = self.client.messages.create(**request)
+        except self._anthropic.APIError as e:
             print(f"API Error: {e}")
-            # Remove the failed message from history
-            self.conversation_history.pop()
             raise
+        
+        # Track token usage
+        self._record_usage(response.usage)
+        
+        # Get response text
+        assistant_message = response.content[0].text
+        
+        # Add to conversation history
+        self._commit_turn(pending, assistant_message)
+        self._messages_sent += 1
+        self._store_response(cache_key, assistant_message)
+        self._trim_history()
+        
+        return assistant_message
     
-    def get_usage_stats(self) -> Dict:
-        """Get token usage and cost statistics"""
-        # Pricing (as of 2025, check anthropic.com/pricing for current rates)
-        input_price = 3.00 / 1_000_000  # $3 per million tokens
-        output_price = 15.00 / 1_000_000  # $15 per million tokens
-        cache_write_price = 3.75 / 1_000_000  # $3.75 per million tokens
-        cache_read_price = 0.30 / 1_000_000  # $0.30 per million tokens
+    def ask_stream(self, question: str, section_files: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Ask Claude a question and yield the answer text as it is generated
+        The full answer is added to the conversation history once the stream ends
+        """
+        pending, request = self._prepare_turn(question, section_files)
+        
+        # Answer from the local response cache if this exact turn was seen before
+        cache_key = self._response_cache_key(pending)
+        cached = self._lookup_response(cache_key)
+        if cached is not None:
+            # Trim before yielding, a consumer may stop after the single chunk
+            self._commit_turn(pending, cached)
+            self._trim_history()
+            yield cached
+            return
+        
+        # An abandoned or failed stream never reaches the commit below
+        chunks = []
+        try:
+            with self.client.messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+                
+                # Track token usage from the final message
+                self._record_usage(stream.get_final_message().usage)
+        except self._anthropic.APIError as e:
+            print(f"API Error: {e}")
+            raise
+        
+        # Add to conversation history
+        assistant_message = "".join(chunks)
+        self._commit_turn(pending, assistant_message)
+        self._messages_sent += 1
+        self._store_response(cache_key, assistant_message)
+        self._trim_history()
+    
+    def _response_cache_key(self, pending: Dict) -> Optional[str]:
+        """
+        Key for the local response cache, or None when caching is disabled
+        Covers the system prompt, the document context and the whole conversation
+        up to and including the pending user turn
+        """
+        if not self.response_cache:
+            return None
+        
+        key = hashlib.blake2b()
+        key.update(self.system_prompt.encode('utf-8'))
+        key.update(self._context_hash.encode('ascii'))
+        key.update(json.dumps(self.conversation_history + [pending], ensure_ascii=False).encode('utf-8'))
+        return key.hexdigest()
+    
+    def _lookup_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return a previously stored answer for this key, if any"""
+        if cache_key is None:
+            return None
         
-        # Calculate costs
-        input_cost = self.total_input_tokens * input_price
-        output_cost = self.total_output_tokens * output_price
-        cache_write_cost = self.cache_creation_tokens * cache_write_price
-        cache_read_cost = self.cache_read_tokens * cache_read_price
+        with shelve.open(self.response_cache) as cache:
+            answer = cache.get(cache_key)
         
-        total_cost = input_cost + output_cost + cache_write_cost + cache_read_cost
+        if answer is not None:
+            self.response_cache_hits += 1
+        return answer
+    
+    def _store_response(self, cache_key: Optional[str], answer: str):
+        """Store an answer in the local response cache"""
+        if cache_key is None:
+            return
+        
+        with shelve.open(self.response_cache) as cache:
+            cache[cache_key] = answer
+    
+    @staticmethod
+    def _mark(message: Dict) -> Dict:
+        """Return a copy of a message whose last content block carries a cache breakpoint"""
+        content = message["content"]
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = [dict(block) for block in content]
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return {"role": message["role"], "content": blocks}
+    
+    def _with_cache_breakpoints(self, history: List[Dict]) -> List[Dict]:
+        """
+        Build the outgoing message list with cache breakpoints on the history prefix.
+        The current user turn and the previous assistant turn are marked so the
+        whole conversation prefix is cached. Stored history stays unmarked, so the
+        breakpoints slide forward with every new turn.
+        """
+        messages = list(history)
+        if messages:
+            messages[-1] = self._mark(messages[-1])
+        if len(messages) >= 3:
+            messages[-2] = self._mark(messages[-2])
+        return messages
+    
+    def get_usage_stats(self) -> Dict:
+        """Get token usage and cost statistics"""
+        total_cost = self._running_cost
         
         # Calculate savings from caching
-        without_cache_cost = (self.total_input_tokens + self.cache_read_tokens) * input_price + output_cost
+        without_cache_cost = ((self.total_input_tokens + self.cache_read_tokens) * _INPUT_PRICE
+                              + self.total_output_tokens * _OUTPUT_PRICE)
         savings = without_cache_cost - total_cost
         
         return {
@@ -265,7 +472,8 @@ Note: Provide analytical insights only, not medical advice."""
             'cache_read_tokens': self.cache_read_tokens,
             'total_cost': total_cost,
             'cache_savings': savings,
-            'messages_sent': len(self.conversation_history) // 2
+            'response_cache_hits': self.response_cache_hits,
+            'messages_sent': self._messages_sent
         }
     
     def print_usage_stats(self):
@@ -283,6 +491,8 @@ Note: Provide analytical insights only, not medical advice."""
         print(f"\nTotal cost: ${stats['total_cost']:.4f}")
         if stats['cache_savings'] > 0:
             print(f"Cache savings: ${stats['cache_savings']:.4f} ✓")
+        if stats['response_cache_hits'] > 0:
+            print(f"Answers reused from local cache: {stats['response_cache_hits']}")
         print("="*60 + "\n")
     
     def reset_conversation(self):
@@ -291,6 +501,73 @@ Note: Provide analytical insights only, not medical advice."""
         print("✓ Conversation history reset")
         print("  Note: System prompt and mode remain unchanged\n")
     
+    def save_session(self, filepath: str):
+        """Save conversation history, mode and token counters to a JSON file"""
+        session = {
+            'mode': self.current_mode,
+            'system_prompt': self.system_prompt,
+            'history': self.conversation_history,
+            'messages_sent': self._messages_sent,
+            'tokens': {
+                'input': self.total_input_tokens,
+                'output': self.total_output_tokens,
+                'cache_creation': self.cache_creation_tokens,
+                'cache_read': self.cache_read_tokens
+            },
+            'cost': self._running_cost
+        }
+        
+        Path(filepath).write_text(json.dumps(session, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"✓ Session saved to {filepath} ({len(self.conversation_history)} messages)\n")
+    
+    def load_session(self, filepath: str):
+        """Restore conversation history, mode and token counters from a JSON file"""
+        session_path = Path(filepath)
+        if not session_path.exists():
+            raise FileNotFoundError(f"Session file not found: {filepath}")
+        
+        session = json.loads(session_path.read_text(encoding='utf-8'))
+        
+        self.current_mode = session['mode']
+        self.system_prompt = session['system_prompt']
+        self.conversation_history = session['history']
+        self._messages_sent = session['messages_sent']
+        self._rebuild_system_messages()
+        
+        tokens = session['tokens']
+        self.total_input_tokens = tokens['input']
+        self.total_output_tokens = tokens['output']
+        self.cache_creation_tokens = tokens['cache_creation']
+        self.cache_read_tokens = tokens['cache_read']
+        self._running_cost = session['cost']
+        
+        print(f"✓ Session resumed from {filepath} ({len(self.conversation_history)} messages)")
+        print(f"  Mode: {self.current_mode}\n")
+    
+    def warm_cache(self):
+        """
+        Refresh the prompt cache with a minimal request
+        Reads the cached system context and conversation prefix, which resets their
+        cache lifetime without adding anything to the conversation history
+        """
+        if not self.document_context:
+            raise ValueError("No context loaded. Call load_context() first.")
+        
+        ping = {"role": "user", "content": "ping"}
+        try:
+            response = self.client.messages.create(
+                model=self.MODEL,
+                max_tokens=1,
+                system=self._system_messages,
+                messages=self._with_cache_breakpoints(self.conversation_history) + [ping]
+            )
+        except self._anthropic.APIError as e:
+            print(f"API Error: {e}")
+            raise
+        
+        self._record_usage(response.usage)
+        print("✓ Prompt cache refreshed\n")
+    
     def save_prompt_template(self, name: str, prompt: str, filepath: str = "prompt_templates.txt"):
         """Save a custom prompt template to a file"""
         with open(filepath, 'a', encoding='utf-8') as f:
@@ -302,6 +579,29 @@ Note: Provide analytical insights only, not medical advice."""
         print(f"✓ Template '{name}' saved to {filepath}\n")
 
 
+def print_streamed_answer(analyzer: ClaudePDFAnalyzer, question: str, section_files: Optional[List[str]] = None):
+    """Print Claude's answer to the terminal as it streams in"""
+    print("\nClaude: ", end="", flush=True)
+    for chunk in analyzer.ask_stream(question, section_files):
+        print(chunk, end="", flush=True)
+    print("\n")
+
+
+def list_section_files(output_path: Path, cache: Dict) -> List[str]:
+    """
+    List section file names in the output directory
+    The listing is cached and only re-read when the directory's mtime changes
+    """
+    if not output_path.is_dir():
+        return []
+    
+    mtime = output_path.stat().st_mtime_ns
+    if cache.get('mtime') != mtime:
+        cache['mtime'] = mtime
+        cache['names'] = sorted(p.name for p in output_path.iterdir() if p.suffix == '.txt')
+    return cache['names']
+
+
 def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
     """Run interactive CLI for asking questions"""
     print("\n" + "="*60)
@@ -318,6 +618,9 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
     print("  save-template <name>     - Save current prompt as template")
     print("  stats                    - Show token usage statistics")
     print("  reset                    - Reset conversation history")
+    print("  save <file>              - Save session to a file")
+    print("  resume <file>            - Resume a saved session")
+    print("  ping                     - Refresh the prompt cache")
     print("  list                     - List available section files")
     print("  help                     - Show this help")
     print("  quit or exit             - Exit")
@@ -325,6 +628,7 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
     print("="*60 + "\n")
     
     output_path = Path(output_dir)
+    section_list_cache = {}
     
     while True:
         try:
@@ -350,6 +654,23 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
             elif command == 'reset':
                 analyzer.reset_conversation()
             
+            elif command == 'save':
+                if not args:
+                    print("Error: Please specify a session file\n")
+                    continue
+                
+                analyzer.save_session(args)
+            
+            elif command == 'resume':
+                if not args:
+                    print("Error: Please specify a session file\n")
+                    continue
+                
+                analyzer.load_session(args)
+            
+            elif command == 'ping':
+                analyzer.warm_cache()
+            
             elif command == 'mode':
                 if not args:
                     print("Error: Please specify a mode\n")
@@ -367,7 +688,7 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
             elif command == 'modes':
                 print("\nAvailable analysis modes:")
                 for mode in analyzer.get_available_modes():
-                    prompt_preview = analyzer.PRESET_PROMPTS[mode].split('\n')[0][:80]
+                    prompt_preview = analyzer.get_preset_prompt(mode).split('\n')[0][:80]
                     print(f"  - {mode}: {prompt_preview}...")
                 print()
             
@@ -402,14 +723,16 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
                 print("  save-template <name>     - Save prompt template")
                 print("  stats                    - Show usage statistics")
                 print("  reset                    - Reset conversation")
+                print("  save <file>              - Save session")
+                print("  resume <file>            - Resume session")
+                print("  ping                     - Refresh prompt cache")
                 print("  list                     - List section files")
                 print("  quit/exit                - Exit\n")
             
             elif command == 'list':
-                section_files = sorted(output_path.glob("*.txt"))
                 print("\nAvailable section files:")
-                for f in section_files:
-                    print(f"  - {f.name}")
+                for name in list_section_files(output_path, section_list_cache):
+                    print(f"  - {name}")
                 print()
             
             elif command == 'load':
@@ -423,24 +746,18 @@ def interactive_mode(analyzer: ClaudePDFAnalyzer, output_dir: str):
                     section_path = output_path / Path(args).name
                 
                 question = f"Please analyze this section in detail:\n\n"
-                print("\nClaude: ", end="", flush=True)
-                response = analyzer.ask(question, [str(section_path)])
-                print(response + "\n")
+                print_streamed_answer(analyzer, question, [str(section_path)])
             
             elif command == 'ask':
                 if not args:
                     print("Error: Please provide a question\n")
                     continue
                 
-                print("\nClaude: ", end="", flush=True)
-                response = analyzer.ask(args)
-                print(response + "\n")
+                print_streamed_answer(analyzer, args)
             
             else:
                 # Treat as direct question
-                print("\nClaude: ", end="", flush=True)
-                response = analyzer.ask(user_input)
-                print(response + "\n")
+                print_streamed_answer(analyzer, user_input)
         
         except KeyboardInterrupt:
             print("\n\nInterrupted. Use 'quit' to exit.\n")
@@ -457,6 +774,7 @@ def main():
     )
     parser.add_argument(
         "context_file",
+        nargs="?",
         help="Path to document context file (e.g., 00_CLAUDE_CONTEXT.md)"
     )
     parser.add_argument(
@@ -472,13 +790,17 @@ def main():
         "--mode",
         "-m",
         default="generic",
-        choices=['generic', 'research', 'legal', 'business', 'technical', 'medical'],
+        choices=ClaudePDFAnalyzer.PRESET_MODES,
         help="Analysis mode preset (default: generic)"
     )
     parser.add_argument(
         "--system-prompt",
         help="Custom system prompt (overrides --mode)"
     )
+    parser.add_argument(
+        "--response-cache",
+        help="File used to cache answers locally and reuse them for repeated questions"
+    )
     parser.add_argument(
         "--list-modes",
         action="store_true",
@@ -501,20 +823,25 @@ def main():
     # List modes and exit
     if args.list_modes:
         print("\nAvailable Analysis Modes:\n")
-        temp_analyzer = ClaudePDFAnalyzer(api_key="dummy")
-        for mode in temp_analyzer.get_available_modes():
-            prompt = temp_analyzer.PRESET_PROMPTS[mode]
+        for mode in ClaudePDFAnalyzer.PRESET_MODES:
+            prompt = ClaudePDFAnalyzer.get_preset_prompt(mode)
             print(f"{mode.upper()}:")
             print(f"  {prompt[:150]}...")
             print()
         sys.exit(0)
     
+    # The context file is only optional when listing modes
+    if not args.context_file:
+        parser.error("the following arguments are required: context_file")
+    
     try:
         # Initialize analyzer with mode or custom prompt
         if args.system_prompt:
-            analyzer = ClaudePDFAnalyzer(api_key=args.api_key, custom_prompt=args.system_prompt)
+            analyzer = ClaudePDFAnalyzer(api_key=args.api_key, custom_prompt=args.system_prompt,
+                                         response_cache=args.response_cache)
         else:
-            analyzer = ClaudePDFAnalyzer(api_key=args.api_key, mode=args.mode)
+            analyzer = ClaudePDFAnalyzer(api_key=args.api_key, mode=args.mode,
+                                         response_cache=args.response_cache)
         
         # Load context
         analyzer.load_context(args.context_file)
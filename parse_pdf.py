@@ -4,64 +4,153 @@ PDF Paragraph Splitter
 Splits PDF content into sections based on table of contents or main paragraphs
 """
 
+import heapq
+import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Tuple
-from pypdf import PdfReader
+from typing import Iterator, List, Dict, Optional, Tuple
+import pymupdf
+
+
+logger = logging.getLogger(__name__)
+
+# Common heading patterns
+_HEADING_PATTERNS = [re.compile(p) for p in (
+    r'^\d+\.?\s+[A-Z]',  # Numbered: "1. Introduction" or "1 Introduction"
+    r'^[A-Z][A-Z\s]{3,}$',  # ALL CAPS
+    r'^Chapter\s+\d+',  # Chapter X
+    r'^Section\s+\d+',  # Section X
+    r'^[IVXLCDM]+\.\s+[A-Z]',  # Roman numerals: "I. Introduction"
+)]
+
+_PARA_SPLIT = re.compile(r'\n\s*\n+')  # Multiple newlines (paragraphs)
+_SENT_SPLIT = re.compile(r'[.!?]+\s+')  # Sentence boundaries (simple approach)
+_HAS_DIGIT = re.compile(r'\d')
+_WORD = re.compile(r'\S+')
+_FNAME_STRIP = re.compile(r'[^\w\s-]')
+_FNAME_WS = re.compile(r'[-\s]+')
+
+# Deletes the ASCII characters _FNAME_STRIP removes, for a regex-free pass over ASCII titles
+_FNAME_DROP_ASCII = str.maketrans('', '', ''.join(chr(c) for c in range(128) if _FNAME_STRIP.match(chr(c))))
+
+# Deletes every ASCII character except A-Z, used to count capitals in ASCII text
+_DROP_NON_UPPER = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isupper()))
+
+# Keywords that mark a sentence as a likely key point
+_IMPORTANT_WORDS = frozenset({
+    'result', 'conclusion', 'found', 'significant', 'important',
+    'demonstrate', 'show', 'indicate', 'suggest', 'recommend',
+    'key', 'main', 'primary', 'critical', 'essential'
+})
+
+# Minimum pages per worker process when parallel extraction is enabled.
+# Measured with PyMuPDF 1.28: ~1.3-1.6 ms per page serially, while a spawned worker
+# needs ~0.3 s to start, import pymupdf and reopen the PDF. Below a few hundred pages
+# per worker the startup cost outweighs the extraction time saved.
+_PARALLEL_MIN_PAGES = 500
+
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[str]:
+    """Extract the text of pages [start, end) from a PDF, run in a worker process"""
+    pdf_path, start, end = args
+    with pymupdf.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, end)]
+
+
+@dataclass(slots=True)
+class Section:
+    """A titled part of the document, page range is only known for TOC-based splits"""
+    title: str
+    content: str
+    level: int = 0
+    start_page: Optional[int] = None
+    end_page: Optional[int] = None
 
 
 class PDFSplitter:
-    def __init__(self, pdf_path: str):
-        """Initialize with PDF file path"""
+    def __init__(self, pdf_path: str, workers: int = 1):
+        """
+        Initialize with PDF file path
+        workers > 1 lets large documents be extracted in that many worker processes.
+        Scripts enabling it must create the splitter under an `if __name__ == "__main__":`
+        guard, since the spawn start method (macOS, Windows) re-imports the main module
+        """
         self.pdf_path = Path(pdf_path)
-        self.reader = PdfReader(str(self.pdf_path))
-        self.total_pages = len(self.reader.pages)
+        self.workers = workers
+        self.doc = pymupdf.open(str(self.pdf_path))
+        self.total_pages = self.doc.page_count
+        self._toc = None
+        self._pages_text = None
         
     def extract_toc(self) -> List[Dict]:
         """
         Extract table of contents from PDF outline/bookmarks
-        Returns list of dicts with title, page_number
+        Returns list of dicts with title, page_number, extracted once and reused on later calls
         """
+        if self._toc is not None:
+            return self._toc
+        
         toc = []
         try:
-            outlines = self.reader.outline
-            if outlines:
-                toc = self._parse_outline(outlines)
+            # [level, title, page] entries with 1-based levels and page numbers
+            for level, title, page in self.doc.get_toc(simple=True):
+                if page < 1:
+                    logger.debug("Could not get page for outline item: %s", title)
+                    continue
+                toc.append({
+                    'title': title,
+                    'page': page - 1,
+                    'level': level - 1
+                })
         except Exception as e:
             print(f"No TOC found or error extracting: {e}")
         
+        self._toc = toc
         return toc
     
-    def _parse_outline(self, outlines, level=0) -> List[Dict]:
-        """Recursively parse PDF outline structure"""
-        toc = []
-        for item in outlines:
-            if isinstance(item, list):
-                # Nested outline
-                toc.extend(self._parse_outline(item, level + 1))
+    def extract_text_by_page(self) -> List[str]:
+        """Extract text from each page, extracted once and reused on later calls"""
+        if self._pages_text is None:
+            workers = min(self.workers, self.total_pages // _PARALLEL_MIN_PAGES)
+            if workers > 1:
+                self._pages_text = self._extract_text_parallel(workers)
             else:
-                # Outline item
-                try:
-                    page_num = self.reader.get_destination_page_number(item)
-                    toc.append({
-                        'title': item.title,
-                        'page': page_num,
-                        'level': level
-                    })
-                except Exception as e:
-                    print(f"Could not get page for outline item: {e}")
-        return toc
+                self._pages_text = [self.doc.load_page(i).get_text("text") for i in range(self.total_pages)]
+        return self._pages_text
     
-    def extract_text_by_page(self) -> List[str]:
-        """Extract text from each page"""
-        pages_text = []
-        for page_num in range(self.total_pages):
-            page = self.reader.pages[page_num]
-            text = page.extract_text()
-            pages_text.append(text)
+    def _extract_text_parallel(self, workers: int) -> List[str]:
+        """
+        Extract page text in worker processes, one contiguous page range each
+        PyMuPDF documents cannot be shared between threads, so every worker opens its own
+        """
+        step = -(-self.total_pages // workers)  # Ceiling division
+        ranges = [(str(self.pdf_path), start, min(start + step, self.total_pages))
+                  for start in range(0, self.total_pages, step)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pages_text = []
+            for chunk in executor.map(_extract_page_range, ranges):
+                pages_text.extend(chunk)
         return pages_text
     
-    def split_by_toc(self) -> List[Dict]:
+    def _iter_paragraphs(self) -> Iterator[str]:
+        """
+        Yield raw paragraphs page by page, without joining the whole document
+        Page boundaries always separate paragraphs
+        """
+        if self._pages_text is not None:
+            pages = iter(self._pages_text)
+        else:
+            pages = (self.doc.load_page(i).get_text("text") for i in range(self.total_pages))
+        
+        for text in pages:
+            yield from _PARA_SPLIT.split(text)
+    
+    def split_by_toc(self) -> List[Section]:
         """
         Split PDF content based on table of contents
         Returns list of sections with title, content, start_page, end_page
@@ -77,45 +166,37 @@ class PDFSplitter:
         # Get all text by page
         pages_text = self.extract_text_by_page()
         
+        # End page is the start of next section, or last page
+        end_pages = [item['page'] for item in toc[1:]] + [self.total_pages]
+        
         sections = []
-        for i, item in enumerate(toc):
+        for item, end_page in zip(toc, end_pages):
             start_page = item['page']
-            # End page is the start of next section, or last page
-            end_page = toc[i + 1]['page'] if i + 1 < len(toc) else self.total_pages
             
-            # Collect content from start to end page
-            content = []
-            for page_num in range(start_page, end_page):
-                if page_num < len(pages_text):
-                    content.append(pages_text[page_num])
+            # Collect content from start to end page (slicing clips to the extracted pages)
+            content = pages_text[start_page:end_page]
             
-            sections.append({
-                'title': item['title'],
-                'level': item.get('level', 0),
-                'start_page': start_page + 1,  # Human-readable page numbers
-                'end_page': end_page,
-                'content': '\n\n'.join(content).strip()
-            })
+            sections.append(Section(
+                title=item['title'],
+                level=item.get('level', 0),
+                start_page=start_page + 1,  # Human-readable page numbers
+                end_page=end_page,
+                content='\n\n'.join(content).strip()
+            ))
         
         return sections
     
-    def split_by_paragraphs(self) -> List[Dict]:
+    def split_by_paragraphs(self) -> List[Section]:
         """
         Split PDF by detecting main paragraphs/sections
         Uses heuristics: large fonts, capitalization, numbering
         """
-        pages_text = self.extract_text_by_page()
-        full_text = '\n\n'.join(pages_text)
-        
-        # Split by multiple newlines (paragraphs)
-        paragraphs = re.split(r'\n\s*\n+', full_text)
-        
         sections = []
         section_num = 1
         current_section = []
         current_title = None
         
-        for para in paragraphs:
+        for para in self._iter_paragraphs():
             para = para.strip()
             if not para:
                 continue
@@ -126,11 +207,10 @@ class PDFSplitter:
             if is_heading:
                 # Save previous section if exists
                 if current_section:
-                    sections.append({
-                        'title': current_title or f"Section {section_num}",
-                        'level': 0,
-                        'content': '\n\n'.join(current_section).strip()
-                    })
+                    sections.append(Section(
+                        title=current_title or f"Section {section_num}",
+                        content='\n\n'.join(current_section).strip()
+                    ))
                     section_num += 1
                 
                 # Start new section
@@ -141,11 +221,10 @@ class PDFSplitter:
         
         # Add last section
         if current_section:
-            sections.append({
-                'title': current_title or f"Section {section_num}",
-                'level': 0,
-                'content': '\n\n'.join(current_section).strip()
-            })
+            sections.append(Section(
+                title=current_title or f"Section {section_num}",
+                content='\n\n'.join(current_section).strip()
+            ))
         
         return sections
     
@@ -156,29 +235,29 @@ class PDFSplitter:
         if len(text) > 200:  # Too long for a heading
             return False
         
-        # Check for common heading patterns
-        heading_patterns = [
-            r'^\d+\.?\s+[A-Z]',  # Numbered: "1. Introduction" or "1 Introduction"
-            r'^[A-Z][A-Z\s]{3,}$',  # ALL CAPS
-            r'^Chapter\s+\d+',  # Chapter X
-            r'^Section\s+\d+',  # Section X
-            r'^[IVXLCDM]+\.\s+[A-Z]',  # Roman numerals: "I. Introduction"
-        ]
-        
-        for pattern in heading_patterns:
-            if re.match(pattern, text.strip()):
-                return True
+        # Check for common heading patterns, all of which start with a digit or a capital
+        # letter, so most body paragraphs skip the regexes on their first character
+        stripped = text.strip()
+        first = stripped[:1]
+        if first.isdigit() or 'A' <= first <= 'Z':
+            for pattern in _HEADING_PATTERNS:
+                if pattern.match(stripped):
+                    return True
         
         # Check if mostly uppercase and short
-        words = text.split()
+        words = text.split(None, 10)  # At most 11 parts, enough to tell if there are more than 10 words
         if len(words) <= 10:  # Short text
-            uppercase_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
+            if text.isascii():
+                uppercase_count = len(text.translate(_DROP_NON_UPPER))
+            else:
+                uppercase_count = sum(map(str.isupper, text))
+            uppercase_ratio = uppercase_count / max(len(text), 1)
             if uppercase_ratio > 0.6:  # Mostly uppercase
                 return True
         
         return False
     
-    def create_document_summary(self, sections: List[Dict]) -> str:
+    def create_document_summary(self, sections: List[Section]) -> str:
         """
         Create a comprehensive document summary optimized for Claude context
         """
@@ -192,33 +271,33 @@ class PDFSplitter:
         # Table of contents
         summary_parts.append("## TABLE OF CONTENTS")
         for i, section in enumerate(sections, 1):
-            indent = "  " * section.get('level', 0)
+            indent = "  " * section.level
             pages = ""
-            if 'start_page' in section:
-                pages = f" [p.{section['start_page']}-{section['end_page']}]"
-            summary_parts.append(f"{indent}{i}. {section['title']}{pages}")
+            if section.start_page is not None:
+                pages = f" [p.{section.start_page}-{section.end_page}]"
+            summary_parts.append(f"{indent}{i}. {section.title}{pages}")
         
         summary_parts.append("\n## SECTION SUMMARIES\n")
         
         # Create summaries for each section
         for i, section in enumerate(sections, 1):
-            summary_parts.append(f"### Section {i}: {section['title']}")
+            summary_parts.append(f"### Section {i}: {section.title}")
             
-            if 'start_page' in section:
-                summary_parts.append(f"**Location:** Pages {section['start_page']}-{section['end_page']}")
+            if section.start_page is not None:
+                summary_parts.append(f"**Location:** Pages {section.start_page}-{section.end_page}")
             
             # Extract key information
-            content = section['content']
-            word_count = len(content.split())
+            content = section.content
+            word_count = sum(1 for _ in _WORD.finditer(content))  # Count without building a word list
             char_count = len(content)
             
             summary_parts.append(f"**Length:** {word_count} words, {char_count} characters")
             
             # Extract first paragraph as preview
-            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-            if paragraphs:
-                preview = paragraphs[0][:300]
-                if len(paragraphs[0]) > 300:
+            first_paragraph = self._first_paragraph(content)
+            if first_paragraph:
+                preview = first_paragraph[:300]
+                if len(first_paragraph) > 300:
                     preview += "..."
                 summary_parts.append(f"**Preview:** {preview}")
             
@@ -240,12 +319,26 @@ class PDFSplitter:
         
         return '\n'.join(summary_parts)
     
+    @staticmethod
+    def _first_paragraph(content: str) -> str:
+        """
+        Return the first non-empty paragraph, stripped
+        Scans with str.find instead of splitting the whole content into paragraphs
+        """
+        start = 0
+        while True:
+            end = content.find('\n\n', start)
+            paragraph = content[start:end if end >= 0 else None].strip()
+            if paragraph or end < 0:
+                return paragraph
+            start = end + 2
+    
     def _extract_key_sentences(self, text: str, max_sentences: int = 3) -> List[str]:
         """
         Extract potentially important sentences using heuristics
         """
         # Split into sentences (simple approach)
-        sentences = re.split(r'[.!?]+\s+', text)
+        sentences = _SENT_SPLIT.split(text)
         sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
         
         if not sentences:
@@ -257,22 +350,16 @@ class PDFSplitter:
             score = 0
             
             # Contains numbers (often important data/facts)
-            if re.search(r'\d+', sentence):
+            if _HAS_DIGIT.search(sentence):
                 score += 2
             
             # Contains quotes
             if '"' in sentence or "'" in sentence:
                 score += 1
             
-            # Contains important keywords
-            important_words = [
-                'result', 'conclusion', 'found', 'significant', 'important',
-                'demonstrate', 'show', 'indicate', 'suggest', 'recommend',
-                'key', 'main', 'primary', 'critical', 'essential'
-            ]
-            for word in important_words:
-                if word in sentence.lower():
-                    score += 1
+            # Contains important keywords (substring match, so "results" counts for "result")
+            lower = sentence.lower()
+            score += sum(word in lower for word in _IMPORTANT_WORDS)
             
             # Not too long, not too short
             if 50 < len(sentence) < 200:
@@ -280,13 +367,13 @@ class PDFSplitter:
             
             scored_sentences.append((score, sentence))
         
-        # Sort by score and get top sentences
-        scored_sentences.sort(reverse=True, key=lambda x: x[0])
-        top_sentences = [s[1] for s in scored_sentences[:max_sentences] if s[0] > 0]
+        # Select the top sentences without sorting them all (ties keep document order)
+        top_scored = heapq.nlargest(max_sentences, scored_sentences, key=itemgetter(0))
+        top_sentences = [s[1] for s in top_scored if s[0] > 0]
         
         return top_sentences
     
-    def save_sections(self, sections: List[Dict], output_dir: str = "output"):
+    def save_sections(self, sections: List[Section], output_dir: str = "output"):
         """Save sections to separate text files and create summary"""
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
@@ -294,19 +381,27 @@ class PDFSplitter:
         # Save individual sections
         for i, section in enumerate(sections, 1):
             # Clean filename
-            title = section['title']
-            filename = re.sub(r'[^\w\s-]', '', title)[:50]
-            filename = re.sub(r'[-\s]+', '_', filename)
+            title = section.title
+            if title.isascii():
+                filename = title.translate(_FNAME_DROP_ASCII)[:50]
+            else:
+                filename = _FNAME_STRIP.sub('', title)[:50]
+            filename = _FNAME_WS.sub('_', filename)
             filepath = output_path / f"{i:02d}_{filename}.txt"
             
+            # Build the whole file body and write it in one call
+            body = [f"Title: {section.title}\n"]
+            if section.start_page is not None:
+                body.append(f"Pages: {section.start_page}-{section.end_page}\n")
+            body.append(f"\n{'='*80}\n\n")
+            body.append(section.content)
+            
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {section['title']}\n")
-                if 'start_page' in section:
-                    f.write(f"Pages: {section['start_page']}-{section['end_page']}\n")
-                f.write(f"\n{'='*80}\n\n")
-                f.write(section['content'])
+                f.write(''.join(body))
             
-            print(f"Saved: {filepath}")
+            logger.debug("Saved: %s", filepath)
+        
+        print(f"Saved {len(sections)} section files to {output_path}")
         
         # Create and save document summary
         print("\nCreating document summary...")
@@ -321,11 +416,13 @@ class PDFSplitter:
         # Also create a Claude-optimized context file
         context_path = output_path / "00_CLAUDE_CONTEXT.md"
         with open(context_path, 'w', encoding='utf-8') as f:
-            f.write("# Document Context for Claude\n\n")
-            f.write("**Instructions:** Upload this file first to give Claude context about the document structure, ")
-            f.write("then upload specific section files for detailed analysis.\n\n")
-            f.write("---\n\n")
-            f.write(summary)
+            f.write(''.join([
+                "# Document Context for Claude\n\n",
+                "**Instructions:** Upload this file first to give Claude context about the document structure, ",
+                "then upload specific section files for detailed analysis.\n\n",
+                "---\n\n",
+                summary
+            ]))
         
         print(f"Saved Claude context: {context_path}")
 
@@ -341,11 +438,13 @@ def main():
     pdf_file = sys.argv[1]
     output_dir = sys.argv[2] if len(sys.argv) > 2 else "output"
     
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    
     print(f"Processing: {pdf_file}")
     print(f"Output directory: {output_dir}")
     print("-" * 80)
     
-    splitter = PDFSplitter(pdf_file)
+    splitter = PDFSplitter(pdf_file, workers=os.cpu_count() or 1)
     
     # Try splitting by TOC first
     sections = splitter.split_by_toc()
@@ -356,10 +455,10 @@ def main():
     # Display section info
     for i, section in enumerate(sections, 1):
         pages_info = ""
-        if 'start_page' in section:
-            pages_info = f" (pages {section['start_page']}-{section['end_page']})"
-        print(f"{i}. {section['title']}{pages_info}")
-        print(f"   Content length: {len(section['content'])} characters")
+        if section.start_page is not None:
+            pages_info = f" (pages {section.start_page}-{section.end_page})"
+        print(f"{i}. {section.title}{pages_info}")
+        print(f"   Content length: {len(section.content)} characters")
     
     # Save to files
     print("\n" + "-" * 80)